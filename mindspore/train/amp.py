@@ -63,7 +63,8 @@ _config_level = {
     "O2": {
         "keep_batchnorm_fp32": True,
         "cast_model_type": mstype.float16,
-        "loss_scale_manager": DynamicLossScaleManager()},
+        # A new `DynamicLossScaleManager` is created in `build_train_network`, it holds device-side state.
+        "loss_scale_manager": None},
     "O3": {
         "keep_batchnorm_fp32": False,
         "cast_model_type": mstype.float16,
@@ -187,6 +188,8 @@ def build_train_network(network, optimizer, loss_fn=None, level='O0', boost_leve
 
     _check_kwargs(kwargs)
     config = dict(_config_level[level], **kwargs)
+    if level == "O2" and "loss_scale_manager" not in kwargs:
+        config["loss_scale_manager"] = DynamicLossScaleManager()
 
     if config["cast_model_type"] == mstype.float16:
         network.to_float(mstype.float16)
@@ -13,9 +13,16 @@
 # limitations under the License.
 # ============================================================================
 """Loss scale manager abstract class."""
-
-from .._checkparam import Validator as validator
+from .. import context
 from .. import nn
+from ..common import dtype as mstype
+from ..common.tensor import Tensor
+from ..common.parameter import Parameter
+from ..ops import functional as F
+from ..ops import operations as P
+
+# Number of `update_loss_scale` calls between two reads of the continuous overflow counter.
+_BAD_STEP_CHECK_INTERVAL = 100
 
 
 class LossScaleManager:
@@ -69,6 +76,9 @@ class FixedLossScaleManager(LossScaleManager):
                              "but got {}".format(loss_scale))
         self._loss_scale = loss_scale
         self._drop_overflow_update = drop_overflow_update
+        self._update_cell = None
+        if drop_overflow_update:
+            self._update_cell = nn.FixedLossScaleUpdateCell(self._loss_scale)
 
     def get_loss_scale(self):
         """
@@ -104,15 +114,82 @@ class FixedLossScaleManager(LossScaleManager):
             None or Cell. Cell object, used to update `loss_scale`, when `drop_overflow_update` is True. None when
             `drop_overflow_update` is False.
         """
-        if not self._drop_overflow_update:
-            return None
-        return nn.FixedLossScaleUpdateCell(self._loss_scale)
+        return self._update_cell
+
+
+class _DynamicLossScaleManagerCell(nn.Cell):
+    """
+    Update the state of `DynamicLossScaleManager` on device.
+
+    Args:
+        manager (DynamicLossScaleManager): The manager whose parameters are updated in place.
+
+    Inputs:
+        - **overflow** (Tensor) - Whether the overflow occurs or not. A bool tensor, it is considered as overflow
+          only when all of its elements are True.
+
+    Outputs:
+        Tensor, the number of continuous overflow steps after the update.
+    """
+    def __init__(self, manager):
+        super(_DynamicLossScaleManagerCell, self).__init__()
+        self.loss_scale = manager.loss_scale
+        self.cur_iter = manager.cur_iter
+        self.last_overflow_iter = manager.last_overflow_iter
+        self.bad_step = manager.bad_step
+        self.increase_ratio = Tensor(manager.increase_ratio, mstype.float32)
+        self.scale_factor = Tensor(manager.scale_factor, mstype.float32)
+        self.scale_window = Tensor(manager.scale_window, mstype.int32)
+        # BitwiseAnd only has an Ascend kernel, other targets keep using Mod.
+        scale_window = manager.scale_window
+        self.use_window_mask = scale_window & (scale_window - 1) == 0 and \
+            context.get_context("device_target") == "Ascend"
+        if self.use_window_mask:
+            self.scale_window_mask = Tensor(scale_window - 1, mstype.int32)
+        self.minimum_loss_scale = Tensor(1.0, mstype.float32)
+        self.bad_step_threshold = Tensor(manager.bad_step_max + 1, mstype.int32)
+        self.zero = Tensor(0, mstype.int32)
+        self.select = P.Select()
+        self.max = P.Maximum()
+        self.min = P.Minimum()
+        self.mod = P.Mod()
+        self.bitwise_and = P.BitwiseAnd()
+        self.reduce_all = P.ReduceAll()
+        self.equal = P.Equal()
+        self.div = P.RealDiv()
+
+    def construct(self, overflow):
+        overflow = self.reduce_all(overflow)
+        loss_scale = self.loss_scale
+        cur_iter = self.cur_iter
+        normal_steps = cur_iter - self.last_overflow_iter
+        if self.use_window_mask:
+            remainder = self.bitwise_and(normal_steps, self.scale_window_mask)
+        else:
+            remainder = self.mod(normal_steps, self.scale_window)
+        should_inc = self.equal(remainder, self.zero)
+        # Divide by `scale_factor` rather than multiply by its reciprocal, which is rounded when it is not
+        # a power of two.
+        loss_scale_on_overflow = self.max(self.div(loss_scale, self.scale_factor), self.minimum_loss_scale)
+        loss_scale_on_normal = self.select(should_inc, loss_scale * self.increase_ratio, loss_scale)
+        F.assign(self.loss_scale, self.select(overflow, loss_scale_on_overflow, loss_scale_on_normal))
+        F.assign(self.last_overflow_iter, self.select(overflow, cur_iter, self.last_overflow_iter))
+        # Once saturated, the counter is kept until the host reads it, so a delayed check still catches it.
+        saturated = self.equal(self.bad_step, self.bad_step_threshold)
+        bad_step = self.select(overflow, self.min(self.bad_step + 1, self.bad_step_threshold),
+                               self.select(saturated, self.bad_step_threshold, self.zero))
+        F.assign(self.bad_step, bad_step)
+        F.assign(self.cur_iter, cur_iter + 1)
+        return bad_step
 
 
 class DynamicLossScaleManager(LossScaleManager):
     """
     Loss scale that dynamically adjusts itself, inherits from LossScaleManager.
 
+    The loss scale and the iteration counters are kept as parameters and updated on device, so that
+    `update_loss_scale` does not copy the loss scale between host and device at every step.
+
     Args:
         init_loss_scale (float): Initialize loss scale. Default: 2**24.
         scale_factor (int): Coefficient of increase and decrease. Default: 2.
@@ -132,49 +209,92 @@ class DynamicLossScaleManager(LossScaleManager):
                  scale_window=2000):
         if init_loss_scale < 1.0:
             raise ValueError("The argument 'init_loss_scale' must be > 1, but got {}".format(init_loss_scale))
-        self.loss_scale = init_loss_scale
-        validator.check_positive_int(scale_window, "scale_window", self.__class__.__name__)
+        self.loss_scale = Parameter(Tensor(init_loss_scale, mstype.float32), name="loss_scale")
+        if not isinstance(scale_window, int):
+            raise TypeError(f"`scale_window` in `{self.__class__.__name__}` must be int, "
+                            f"but got `{type(scale_window).__name__}`")
+        if isinstance(scale_window, bool) or scale_window <= 0:
+            type_except = TypeError if isinstance(scale_window, bool) else ValueError
+            raise type_except(f"`scale_window` in `{self.__class__.__name__}` should be an int and must > 0, "
+                              f"but got `{scale_window}` with type `{type(scale_window).__name__}`.")
         self.scale_window = scale_window
         if scale_factor <= 0:
             raise ValueError("The argument 'scale_factor' must be > 0, but got {}".format(scale_factor))
         self.scale_factor = scale_factor
         self.increase_ratio = scale_factor
+        # Kept only for backward compatibility, the update graph divides by `scale_factor` instead.
         self.decrease_ratio = 1 / scale_factor
-        self.cur_iter = 1
-        self.last_overflow_iter = 0
+        self.cur_iter = Parameter(Tensor(1, mstype.int32), name="cur_iter")
+        self.last_overflow_iter = Parameter(Tensor(0, mstype.int32), name="last_overflow_iter")
+        self.bad_step = Parameter(Tensor(0, mstype.int32), name="bad_step")
+        self._manager_cell = None
         self.bad_step_max = 1000
-        self.bad_step = 0
+
+    @property
+    def bad_step_max(self):
+        """Maximum continuous overflow steps before `update_loss_scale` raises an error."""
+        return self._bad_step_threshold_plus_one - 1
+
+    @bad_step_max.setter
+    def bad_step_max(self, value):
+        if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+            raise ValueError(f"The argument 'bad_step_max' must be an int >= 0, but got {value}.")
+        # The counter saturates at this threshold on device, so reaching it means the maximum is exceeded.
+        self._bad_step_threshold_plus_one = value + 1
+        self._bad_step_check_interval = min(_BAD_STEP_CHECK_INTERVAL, value + 1)
+        self._steps_since_check = 0
+        self._manager_cell = None
 
     def get_loss_scale(self):
         """
-        Get loss scale value.
+        Get loss scale value. The value is copied from device only when this interface is called.
 
         Returns:
-            bool, `loss_scale` value.
+            float, `loss_scale` value.
         """
-        return self.loss_scale
+        return float(self.loss_scale.asnumpy())
 
-    def update_loss_scale(self, overflow):
+    def set_loss_scale(self, loss_scale):
         """
-        Update loss scale value.
+        Set loss scale value. Update cells returned by `get_update_cell` afterwards start from the new value.
 
         Args:
-            overflow (bool): Whether it overflows.
+            loss_scale (float): The new loss scale value.
         """
-        if overflow:
-            self.loss_scale = max(self.loss_scale * self.decrease_ratio, 1)
-            self.last_overflow_iter = self.cur_iter
-            self.bad_step += 1
-        else:
-            if (self.cur_iter - self.last_overflow_iter) % self.scale_window == 0:
-                self.loss_scale *= self.increase_ratio
-            self.bad_step = 0
+        if loss_scale < 1.0:
+            raise ValueError("The argument 'loss_scale' must be >= 1, but got {}".format(loss_scale))
+        self.loss_scale.set_data(Tensor(loss_scale, mstype.float32))
 
-        if self.bad_step > self.bad_step_max:
-            raise RuntimeError("Dynamic loss scale Continuous overflow ", self.bad_step,
-                               " times, has exceeded maximum threshold.")
+    def update_loss_scale(self, overflow):
+        """
+        Update loss scale value.
 
-        self.cur_iter += 1
+        The overflow reduction and the update of loss scale are executed on device in one graph. When `overflow` is
+        a Tensor, it can be passed directly from the outputs of the training network without copying it to host.
+        The continuous overflow counter is read from device only periodically, so the error for exceeding
+        `bad_step_max` may be raised a few steps after the threshold is reached.
+
+        Args:
+            overflow (Union[bool, Tensor]): Whether it overflows.
+        """
+        if self._manager_cell is None:
+            self._manager_cell = _DynamicLossScaleManagerCell(self)
+        if not isinstance(overflow, Tensor):
+            overflow = Tensor(bool(overflow), mstype.bool_)
+        self._manager_cell(overflow)
+
+        self._steps_since_check += 1
+        if self._steps_since_check == self._bad_step_check_interval:
+            self._steps_since_check = 0
+            bad_step = int(self.bad_step.asnumpy())
+            if bad_step == self._bad_step_threshold_plus_one:
+                self.bad_step.set_data(Tensor(0, mstype.int32))
+                self._raise_overflow(bad_step)
+
+    def _raise_overflow(self, bad_step):
+        """Raise the error for continuous overflow, kept out of `update_loss_scale`."""
+        raise RuntimeError(f"Dynamic loss scale continuous overflow {bad_step} times, has exceeded maximum "
+                           f"threshold {self.bad_step_max}.")
 
     def get_drop_overflow_update(self):
         """
@@ -192,4 +312,4 @@ class DynamicLossScaleManager(LossScaleManager):
         Returns:
             Cell, cell object used to update `loss_scale`.
         """
-        return nn.DynamicLossScaleUpdateCell(self.loss_scale, self.scale_factor, self.scale_window)
+        return nn.DynamicLossScaleUpdateCell(self.get_loss_scale(), self.scale_factor, self.scale_window)
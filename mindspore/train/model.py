@@ -37,6 +37,7 @@ from ..context import ParallelMode
 from ..parallel._cost_model_context import _set_multi_subgraphs
 from .dataset_helper import DatasetHelper, connect_network_with_dataset
 from . import amp
+from .loss_scale_manager import DynamicLossScaleManager
 from ..common.api import _pynative_executor
 
 
@@ -633,7 +634,10 @@ class Model:
                 cb_params.net_outputs = outputs
                 if self._loss_scale_manager and self._loss_scale_manager.get_drop_overflow_update():
                     _, overflow, _ = outputs
-                    overflow = np.all(overflow.asnumpy())
+                    # Only the built-in dynamic update takes the overflow Tensor, user overrides still get a bool.
+                    if type(self._loss_scale_manager).update_loss_scale is not \
+                            DynamicLossScaleManager.update_loss_scale:
+                        overflow = np.all(overflow.asnumpy())
                     self._loss_scale_manager.update_loss_scale(overflow)
 
                 list_callback.step_end(run_context)
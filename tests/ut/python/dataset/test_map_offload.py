@@ -12,13 +12,60 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ==============================================================================
+import hashlib
+import os
+import tempfile
+
 import numpy as np
 
+import mindspore
 import mindspore.dataset as ds
 import mindspore.dataset.vision.c_transforms as C
 
 
 DATA_DIR = "../data/dataset/testPK/data"
+CACHE_DIR = os.path.join(tempfile.gettempdir(), "mindspore_ut_cache")
+USE_UT_CACHE = os.environ.get("MS_USE_UT_CACHE") == "1"
+
+
+def get_reference_images(cache_name, build_dataset):
+    """
+    Get all image batches of the reference dataset concatenated into one array. When MS_USE_UT_CACHE=1, they are
+    loaded from the cache file saved by a previous run, and the reference dataset is only built if that file does
+    not exist yet. The datasets are read without shuffle, so the cached order does not depend on the seed. The
+    cache file is keyed on the MindSpore version and the location of the dataset, so other builds or checkouts do
+    not reuse it.
+    """
+    dataset_name = os.path.basename(os.path.dirname(DATA_DIR))
+    data_dir_hash = hashlib.md5(os.path.abspath(DATA_DIR).encode()).hexdigest()[:8]
+    cache_file = os.path.join(CACHE_DIR, "{}_{}_{}_{}.npy".format(cache_name, dataset_name, mindspore.__version__,
+                                                                  data_dir_hash))
+    if USE_UT_CACHE and os.path.exists(cache_file):
+        return np.load(cache_file)
+
+    images = concat_images(build_dataset())
+    if USE_UT_CACHE:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # Write to a temporary file first, so concurrent runs never load a partially written cache.
+        fd, tmp_file = tempfile.mkstemp(suffix=".npy", dir=CACHE_DIR)
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, images)
+        os.replace(tmp_file, cache_file)
+    return images
+
+
+def build_decoded_dataset():
+    """
+    Build the image folder dataset with decoded images. A dataset node can only have one consumer, so every
+    pipeline builds its own copy from here and differs only by the map operations added after it.
+    """
+    dataset = ds.ImageFolderDataset(DATA_DIR, shuffle=False)
+    return dataset.map(operations=[C.Decode()], input_columns="image")
+
+
+def concat_images(dataset):
+    """Concatenate all image batches of the dataset into one array."""
+    return np.concatenate([img for img, _ in dataset.create_tuple_iterator(num_epochs=1, output_numpy=True)])
 
 
 def test_offload():
@@ -28,20 +75,19 @@ def test_offload():
     Expectation: Output should be same with activated or deactivated offload.
     """
     # Dataset with offload activated.
-    dataset_0 = ds.ImageFolderDataset(DATA_DIR)
-    dataset_0 = dataset_0.map(operations=[C.Decode()], input_columns="image")
+    dataset_0 = build_decoded_dataset()
     dataset_0 = dataset_0.map(operations=[C.HWC2CHW()], input_columns="image", offload=True)
     dataset_0 = dataset_0.batch(8, drop_remainder=True)
 
     # Dataset with offload not activated.
-    dataset_1 = ds.ImageFolderDataset(DATA_DIR)
-    dataset_1 = dataset_1.map(operations=[C.Decode()], input_columns="image")
-    dataset_1 = dataset_1.map(operations=[C.HWC2CHW()], input_columns="image")
-    dataset_1 = dataset_1.batch(8, drop_remainder=True)
+    def build_dataset_1():
+        dataset_1 = build_decoded_dataset()
+        dataset_1 = dataset_1.map(operations=[C.HWC2CHW()], input_columns="image")
+        return dataset_1.batch(8, drop_remainder=True)
+
+    images_1 = get_reference_images("test_map_offload_ref", build_dataset_1)
 
-    for (img_0, _), (img_1, _) in zip(dataset_0.create_tuple_iterator(num_epochs=1, output_numpy=True),
-                                      dataset_1.create_tuple_iterator(num_epochs=1, output_numpy=True)):
-        np.testing.assert_array_equal(img_0, img_1)
+    np.testing.assert_array_equal(concat_images(dataset_0), images_1)
 
 
 def test_auto_offload():
@@ -53,19 +99,20 @@ def test_auto_offload():
     trans = [C.Decode(), C.HWC2CHW()]
 
     # Dataset with config.auto_offload not activated
-    dataset_auto_disabled = ds.ImageFolderDataset(DATA_DIR)
-    dataset_auto_disabled = dataset_auto_disabled.map(operations=trans, input_columns="image")
-    dataset_auto_disabled = dataset_auto_disabled.batch(8, drop_remainder=True)
+    def build_dataset_auto_disabled():
+        dataset_auto_disabled = ds.ImageFolderDataset(DATA_DIR, shuffle=False)
+        dataset_auto_disabled = dataset_auto_disabled.map(operations=trans, input_columns="image")
+        return dataset_auto_disabled.batch(8, drop_remainder=True)
+
+    images_auto_disabled = get_reference_images("test_auto_offload_ref", build_dataset_auto_disabled)
 
     # Dataset with config.auto_offload activated
     ds.config.set_auto_offload(True)
-    dataset_auto_enabled = ds.ImageFolderDataset(DATA_DIR)
+    dataset_auto_enabled = ds.ImageFolderDataset(DATA_DIR, shuffle=False)
     dataset_auto_enabled = dataset_auto_enabled.map(operations=trans, input_columns="image")
     dataset_auto_enabled = dataset_auto_enabled.batch(8, drop_remainder=True)
 
-    for (img_0, _), (img_1, _) in zip(dataset_auto_disabled.create_tuple_iterator(num_epochs=1, output_numpy=True),
-                                      dataset_auto_enabled.create_tuple_iterator(num_epochs=1, output_numpy=True)):
-        np.testing.assert_array_equal(img_0, img_1)
+    np.testing.assert_array_equal(images_auto_disabled, concat_images(dataset_auto_enabled))
 
 
 if __name__ == "__main__":
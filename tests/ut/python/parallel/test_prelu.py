@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import numpy as np
+import pytest
 
 import mindspore as ms
 import mindspore.nn as nn
@@ -25,6 +26,31 @@ from tests.ut.python.ops.test_math_ops import VirtualLoss
 
 
 grad_all = C.GradOperation(get_all=True)
+_RNG = np.random.default_rng(0)
+
+
+class PReLUNet(nn.Cell):
+    def __init__(self, strategy=None):
+        super().__init__()
+        self.prelu = P.PReLU()
+        if strategy is not None:
+            self.prelu.shard(strategy)
+
+    def construct(self, x, y):
+        out = self.prelu(x, y)
+        return out
+
+
+class MatMulPReLUNet(nn.Cell):
+    def __init__(self, strategy1, strategy2):
+        super().__init__()
+        self.matmul = P.MatMul().shard(strategy1)
+        self.prelu = P.PReLU().shard(strategy2)
+
+    def construct(self, x, y, w):
+        out = self.matmul(x, y)
+        out = self.prelu(out, w)
+        return out
 
 
 class NetWithLoss(nn.Cell):
@@ -47,165 +73,78 @@ class GradWrap(nn.Cell):
         return grad_all(self.network)(x, y)
 
 
-def compile_net(net, x, y):
-    net.set_auto_parallel()
-    net.set_train()
-    _cell_graph_executor.compile(net, x, y)
+class NetWithLoss3(nn.Cell):
+    def __init__(self, network):
+        super(NetWithLoss3, self).__init__()
+        self.loss = VirtualLoss()
+        self.network = network
 
+    def construct(self, x, y, w):
+        predict = self.network(x, y, w)
+        return self.loss(predict)
 
-def test_prelu_single_success1():
-    class Net(nn.Cell):
-        def __init__(self):
-            super().__init__()
-            self.prelu = P.PReLU()
 
-        def construct(self, x, y):
-            out = self.prelu(x, y)
-            return out
+class GradWrap3(nn.Cell):
+    def __init__(self, network):
+        super(GradWrap3, self).__init__()
+        self.network = network
 
-    context.reset_auto_parallel_context()
-    net = GradWrap(NetWithLoss(Net()))
-    x = Tensor(np.random.rand(1, 33, 4, 4), ms.float32)
-    w = Tensor(np.random.rand(33), ms.float32)
-    compile_net(net, x, w)
+    def construct(self, x, y, w):
+        return grad_all(self.network)(x, y, w)
 
 
-def test_prelu_single_success2():
-    class Net(nn.Cell):
-        def __init__(self):
-            super().__init__()
-            self.prelu = P.PReLU()
+def setup_function():
+    context.reset_auto_parallel_context()
 
-        def construct(self, x, y):
-            out = self.prelu(x, y)
-            return out
 
+def teardown_function():
     context.reset_auto_parallel_context()
-    net = GradWrap(NetWithLoss(Net()))
-    x = Tensor(np.random.rand(1, 33, 4, 4), ms.float32)
-    w = Tensor([0.1], ms.float32)
-    compile_net(net, x, w)
 
 
-def test_prelu_parallel_success1():
-    class Net(nn.Cell):
-        def __init__(self, strategy):
-            super().__init__()
-            self.prelu = P.PReLU().shard(strategy)
+def compile_net(net, x, y):
+    net.set_auto_parallel()
+    net.set_train()
+    _cell_graph_executor.compile(net, x, y)
 
-        def construct(self, x, y):
-            out = self.prelu(x, y)
-            return out
 
-    context.reset_auto_parallel_context()
-    context.set_auto_parallel_context(device_num=8, global_rank=0)
-    context.set_auto_parallel_context(parallel_mode="semi_auto_parallel")
-    strategy = ((1, 1, 1, 1), (1,))
-    x = Tensor(np.random.rand(4, 4, 32, 64), dtype=ms.float32)
-    w = Tensor(np.random.rand(4), dtype=ms.float32)
-    net = GradWrap(NetWithLoss(Net(strategy)))
+def test_prelu_single_success1():
+    net = GradWrap(NetWithLoss(PReLUNet()))
+    x = Tensor(_RNG.random((1, 33, 4, 4), dtype=np.float32))
+    w = Tensor(_RNG.random((33,), dtype=np.float32))
     compile_net(net, x, w)
 
 
-def test_prelu_parallel_success2():
-    class Net(nn.Cell):
-        def __init__(self, strategy):
-            super().__init__()
-            self.prelu = P.PReLU().shard(strategy)
+def test_prelu_single_success2():
+    net = GradWrap(NetWithLoss(PReLUNet()))
+    x = Tensor(_RNG.random((1, 33, 4, 4), dtype=np.float32))
+    w = Tensor([0.1], ms.float32)
+    compile_net(net, x, w)
 
-        def construct(self, x, y):
-            out = self.prelu(x, y)
-            return out
 
-    context.reset_auto_parallel_context()
-    context.set_auto_parallel_context(device_num=64, global_rank=0)
+@pytest.mark.parametrize("device_num, strategy, x_shape, w_shape", [
+    (8, ((1, 1, 1, 1), (1,)), (4, 4, 32, 64), (4,)),
+    (64, ((2, 1, 4, 8), (1,)), (4, 4, 32, 64), (4,)),
+    (64, ((2, 4, 4, 2), (4,)), (4, 16, 32, 64), (16,)),
+    (64, ((2, 4, 4, 2), (1,)), (4, 16, 32, 64), (1,)),
+])
+def test_prelu_parallel_success(device_num, strategy, x_shape, w_shape):
+    context.set_auto_parallel_context(device_num=device_num, global_rank=0)
     context.set_auto_parallel_context(parallel_mode="semi_auto_parallel")
-    strategy = ((2, 1, 4, 8), (1,))
-    x = Tensor(np.random.rand(4, 4, 32, 64), dtype=ms.float32)
-    w = Tensor(np.random.rand(4), dtype=ms.float32)
-    net = GradWrap(NetWithLoss(Net(strategy)))
+    x = Tensor(_RNG.random(x_shape, dtype=np.float32))
+    w = Tensor(_RNG.random(w_shape, dtype=np.float32))
+    net = GradWrap(NetWithLoss(PReLUNet(strategy)))
     compile_net(net, x, w)
 
 
 def test_prelu_parallel_success3():
-    class NetWithLoss3(nn.Cell):
-        def __init__(self, network):
-            super(NetWithLoss3, self).__init__()
-            self.loss = VirtualLoss()
-            self.network = network
-
-        def construct(self, x, y, w):
-            predict = self.network(x, y, w)
-            return self.loss(predict)
-
-    class GradWrap3(nn.Cell):
-        def __init__(self, network):
-            super(GradWrap3, self).__init__()
-            self.network = network
-
-        def construct(self, x, y, w):
-            return grad_all(self.network)(x, y, w)
-
-    class Net(nn.Cell):
-        def __init__(self, strategy1, strategy2):
-            super().__init__()
-            self.matmul = P.MatMul().shard(strategy1)
-            self.prelu = P.PReLU().shard(strategy2)
-
-        def construct(self, x, y, w):
-            out = self.matmul(x, y)
-            out = self.prelu(out, w)
-            return out
-
-    context.reset_auto_parallel_context()
     context.set_auto_parallel_context(device_num=64, global_rank=0)
     context.set_auto_parallel_context(parallel_mode="semi_auto_parallel")
     strategy1 = ((2, 4), (4, 2))
     strategy2 = ((32, 1), (1,))
-    x = Tensor(np.random.rand(128, 64), dtype=ms.float32)
-    y = Tensor(np.random.rand(64, 16), dtype=ms.float32)
-    w = Tensor(np.random.rand(16), dtype=ms.float32)
-    net = GradWrap3(NetWithLoss3(Net(strategy1, strategy2)))
+    x = Tensor(_RNG.random((128, 64), dtype=np.float32))
+    y = Tensor(_RNG.random((64, 16), dtype=np.float32))
+    w = Tensor(_RNG.random((16,), dtype=np.float32))
+    net = GradWrap3(NetWithLoss3(MatMulPReLUNet(strategy1, strategy2)))
     net.set_auto_parallel()
     net.set_train()
     _cell_graph_executor.compile(net, x, y, w)
-
-
-def test_prelu_parallel_success4():
-    class Net(nn.Cell):
-        def __init__(self, strategy):
-            super().__init__()
-            self.prelu = P.PReLU().shard(strategy)
-
-        def construct(self, x, y):
-            out = self.prelu(x, y)
-            return out
-
-    context.reset_auto_parallel_context()
-    context.set_auto_parallel_context(device_num=64, global_rank=0)
-    context.set_auto_parallel_context(parallel_mode="semi_auto_parallel")
-    strategy = ((2, 4, 4, 2), (4,))
-    x = Tensor(np.random.rand(4, 16, 32, 64), dtype=ms.float32)
-    w = Tensor(np.random.rand(16), dtype=ms.float32)
-    net = GradWrap(NetWithLoss(Net(strategy)))
-    compile_net(net, x, w)
-
-
-def test_prelu_parallel_success5():
-    class Net(nn.Cell):
-        def __init__(self, strategy):
-            super().__init__()
-            self.prelu = P.PReLU().shard(strategy)
-
-        def construct(self, x, y):
-            out = self.prelu(x, y)
-            return out
-
-    context.reset_auto_parallel_context()
-    context.set_auto_parallel_context(device_num=64, global_rank=0)
-    context.set_auto_parallel_context(parallel_mode="semi_auto_parallel")
-    strategy = ((2, 4, 4, 2), (1,))
-    x = Tensor(np.random.rand(4, 16, 32, 64), dtype=ms.float32)
-    w = Tensor(np.random.rand(1), dtype=ms.float32)
-    net = GradWrap(NetWithLoss(Net(strategy)))
-    compile_net(net, x, w)
@@ -0,0 +1,118 @@
+# Copyright 2021 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+""" test loss scale manager """
+import numpy as np
+import pytest
+
+import mindspore.context as context
+from mindspore import Tensor
+from mindspore import nn
+from mindspore.train.loss_scale_manager import DynamicLossScaleManager, FixedLossScaleManager
+
+
+def setup_module(module):
+    _ = module
+    context.set_context(mode=context.GRAPH_MODE)
+
+
+def test_dynamic_loss_scale_manager_update():
+    manager = DynamicLossScaleManager(init_loss_scale=2 ** 10, scale_factor=2, scale_window=2)
+    manager.update_loss_scale(True)
+    assert manager.get_loss_scale() == 2 ** 9
+    manager.update_loss_scale(False)
+    assert manager.get_loss_scale() == 2 ** 9
+    manager.update_loss_scale(False)
+    assert manager.get_loss_scale() == 2 ** 10
+
+
+def test_dynamic_loss_scale_manager_minimum():
+    manager = DynamicLossScaleManager(init_loss_scale=2, scale_factor=4, scale_window=10)
+    manager.update_loss_scale(True)
+    assert manager.get_loss_scale() == 1
+
+
+def test_dynamic_loss_scale_manager_bad_step():
+    manager = DynamicLossScaleManager(init_loss_scale=2 ** 10)
+    manager.bad_step_max = 2
+    manager.update_loss_scale(True)
+    manager.update_loss_scale(True)
+    with pytest.raises(RuntimeError):
+        manager.update_loss_scale(True)
+
+
+def test_dynamic_loss_scale_manager_update_cell():
+    manager = DynamicLossScaleManager(init_loss_scale=2 ** 10)
+    update_cell = manager.get_update_cell()
+    assert isinstance(update_cell, nn.DynamicLossScaleUpdateCell)
+    assert update_cell.get_loss_scale() == 2 ** 10
+
+
+def test_fixed_loss_scale_manager_update_cell():
+    assert FixedLossScaleManager(drop_overflow_update=False).get_update_cell() is None
+    update_cell = FixedLossScaleManager(128.0).get_update_cell()
+    assert isinstance(update_cell, nn.FixedLossScaleUpdateCell)
+    assert update_cell.get_loss_scale() == 128.0
+
+
+def test_dynamic_loss_scale_manager_non_power_of_two_factor():
+    manager = DynamicLossScaleManager(init_loss_scale=27, scale_factor=3, scale_window=10)
+    manager.update_loss_scale(True)
+    manager.update_loss_scale(True)
+    assert manager.get_loss_scale() == 3
+
+
+def test_dynamic_loss_scale_manager_update_with_tensor():
+    manager = DynamicLossScaleManager(init_loss_scale=2 ** 10, scale_factor=2, scale_window=2)
+    manager.update_loss_scale(Tensor(np.array([True, True])))
+    assert manager.get_loss_scale() == 2 ** 9
+    manager.update_loss_scale(Tensor(np.array([True, False])))
+    manager.update_loss_scale(Tensor(False))
+    assert manager.get_loss_scale() == 2 ** 10
+
+
+def test_dynamic_loss_scale_manager_set_loss_scale():
+    manager = DynamicLossScaleManager(init_loss_scale=2 ** 10)
+    update_cell = manager.get_update_cell()
+    assert manager.get_update_cell() is not update_cell
+    manager.set_loss_scale(2 ** 8)
+    assert manager.get_loss_scale() == 2 ** 8
+    assert manager.get_update_cell().get_loss_scale() == 2 ** 8
+
+
+def test_dynamic_loss_scale_manager_invalid_scale_window():
+    with pytest.raises(TypeError):
+        DynamicLossScaleManager(scale_window=2.0)
+    with pytest.raises(TypeError):
+        DynamicLossScaleManager(scale_window=True)
+    with pytest.raises(ValueError):
+        DynamicLossScaleManager(scale_window=0)
+
+
+def test_dynamic_loss_scale_manager_invalid_bad_step_max():
+    manager = DynamicLossScaleManager()
+    with pytest.raises(ValueError):
+        manager.bad_step_max = -1
+
+
+def test_dynamic_loss_scale_manager_periodic_bad_step_check():
+    manager = DynamicLossScaleManager(init_loss_scale=2 ** 10)
+    manager.bad_step_max = 150
+    for _ in range(151):
+        manager.update_loss_scale(True)
+    for _ in range(48):
+        manager.update_loss_scale(False)
+    with pytest.raises(RuntimeError):
+        manager.update_loss_scale(False)
+    assert int(manager.bad_step.asnumpy()) == 0